@@ -2,9 +2,13 @@ r"""
 Functions for matrices and vectors.
 """
 
+import functools
+from fractions import Fraction
 from .core import *
+from .core import norm_num
 from .manipulate import *
 from .arith import *
+from .arith import split_summand
 
 __all__ = [
     "vector", "matrix", "is_vector",
@@ -40,6 +44,11 @@ def matrix(*rows):
         raise ValueError("Not all rows in the matrix have the same length.")
     return Expr("matrix", rows)
 
+def _matrix_unchecked(rows):
+    """(internal) Like `matrix`, but takes a list of rows and skips validation.
+    For rows that are already known to be nonempty and of the same length."""
+    return Expr("matrix", rows)
+
 def vector_of(x, n):
     """Example: `vector_of(x, 3)` gives `vector(x[1], x[2], x[3])`."""
     return vector(*(x[i] for i in irange(n)))
@@ -57,7 +66,9 @@ def coord_vec(n, i):
         raise ValueError("We require vectors to have at least one entry")
     if not (1 <= i <= n):
         raise ValueError("Second argument must be in the range 1 through n")
-    return vector(*(int(i == j) for j in irange(n)))
+    rows = [[0] for j in range(n)]
+    rows[i - 1][0] = 1
+    return _matrix_unchecked(rows)
 
 def matrix_of(x, m, n):
     """Example; `matrix_of(x, 3, 2)` gives
@@ -73,7 +84,11 @@ def diagonal_matrix(*entries):
     """`diagonal_matrix(a11, a22, ..., ann)` gives an nxn matrix whose diagonal is given by these n expressions."""
     if not entries:
         raise ValueError("We require matrices to have at least one row and column.")
-    return matrix(*([entries[i] if i == j else 0 for j in range(len(entries))] for i in range(len(entries))))
+    n = len(entries)
+    rows = [[0] * n for i in range(n)]
+    for i in range(n):
+        rows[i][i] = entries[i]
+    return _matrix_unchecked(rows)
 
 
 def identity_matrix(n):
@@ -81,18 +96,21 @@ def identity_matrix(n):
     assert isinstance(n, int)
     if n <= 0:
         raise ValueError("We require matrices to have at least one row and column.")
-    return matrix(*[[1 if i == j else 0 for j in range(n)] for i in range(n)])
+    rows = [[0] * n for i in range(n)]
+    for i in range(n):
+        rows[i][i] = 1
+    return _matrix_unchecked(rows)
 
 def zero_matrix(n):
     """Returns the n by n zero matrix."""
     assert isinstance(n, int)
     if n <= 0:
         raise ValueError("We require matrices to have at least one row and column.")
-    return matrix(*[[0 for j in range(n)] for i in range(n)])
+    return _matrix_unchecked([[0] * n for i in range(n)])
 
 def is_vector(e):
     """A vector is a matrix whose rows each have one entry."""
-    return head(e) == "matrix" and ncols(e) == 1
+    return head(e) == "matrix" and len(e.args[0]) == 1
 
 def vector_entries(e):
     """Returns a list of the entries of the given vector.
@@ -136,8 +154,9 @@ def row(e, i):
             raise ValueError("expecting int or iterable (for example a list) for second argument")
     if not all(type(i) == int for i in idxs):
         raise ValueError("Expecting the indices to be ints")
+    m = nrows(e)
     for i in idxs:
-        if not (1 <= i <= nrows(e)):
+        if not (1 <= i <= m):
             raise ValueError(f"index {i} is out of bounds")
     return matrix(*(e.args[i - 1][:] for i in idxs))
 
@@ -161,8 +180,9 @@ def col(e, i):
             raise ValueError("expecting int or iterable (for example a list) for second argument")
     if not all(type(i) == int for i in idxs):
         raise ValueError("Expecting the indices to be ints")
+    n = ncols(e)
     for i in idxs:
-        if not (1 <= i <= ncols(e)):
+        if not (1 <= i <= n):
             raise ValueError(f"index {i} is out of bounds")
     return matrix(*([row[i - 1] for i in idxs] for row in e.args))
 
@@ -176,14 +196,18 @@ def cols(e):
     """Returns a list of the columns of the matrix as column vectors."""
     if head(e) != "matrix":
         raise ValueError("expecting a matrix")
-    return [vector(*col) for col in zip(*e.args)]
+    return [vector(*col) for col in _cols_raw(e)]
+
+def _cols_raw(e):
+    """(internal) The columns of the matrix as tuples of entries."""
+    return list(zip(*e.args))
 
 @downvalue("transpose", def_expr=True)
 def transpose(e):
     """Returns the transpose of the matrix."""
     if head(e) != "matrix":
         raise Inapplicable
-    return matrix(*(list(col) for col in zip(*e.args)))
+    return _matrix_unchecked([list(col) for col in zip(*e.args)])
 
 @downvalue("dot", def_expr=True)
 def dot(v, w):
@@ -282,11 +306,12 @@ def rule_part_vector(e, idx):
         raise Inapplicable
     if type(idx) != int:
         raise ValueError(f"Expecting integer for index, not {idx}")
-    if ncols(e) != 1:
+    rows = e.args
+    if len(rows[0]) != 1:
         raise ValueError(f"Need two indices to index a matrix, not one.")
-    if not (1 <= idx <= nrows(e)):
-        raise ValueError(f"Index {idx} is out of bounds for vector of length {nrows(e)}.")
-    return e.args[idx - 1][0]
+    if not (1 <= idx <= len(rows)):
+        raise ValueError(f"Index {idx} is out of bounds for vector of length {len(rows)}.")
+    return rows[idx - 1][0]
 
 @downvalue("Part")
 def rule_part_matrix(e, idx1, idx2):
@@ -297,40 +322,160 @@ def rule_part_matrix(e, idx1, idx2):
         raise ValueError(f"Expecting integer for first index, not {idx1}")
     if type(idx2) != int:
         raise ValueError(f"Expecting integer for second index, not {idx2}")
-    if not (1 <= idx1 <= nrows(e)):
-        raise ValueError(f"First index {idx1} is out of bounds for matrix with {nrows(e)} rows.")
-    if not (1 <= idx2 <= ncols(e)):
-        raise ValueError(f"Second index {idx2} is out of bounds for matrix with {ncols(e)} columns.")
-    return e.args[idx1 - 1][idx2 - 1]
+    rows = e.args
+    if not (1 <= idx1 <= len(rows)):
+        raise ValueError(f"First index {idx1} is out of bounds for matrix with {len(rows)} rows.")
+    if not (1 <= idx2 <= len(rows[0])):
+        raise ValueError(f"Second index {idx2} is out of bounds for matrix with {len(rows[0])} columns.")
+    return rows[idx1 - 1][idx2 - 1]
+
+def _is_numeric(e):
+    """(internal) Whether every entry of the matrix is a plain Python number.
+    (Other kinds of numbers are left to the general code, which handles them too.)"""
+    return all(type(v) in (int, Fraction, float, complex) for row in e.args for v in row)
+
+def _is_exact(e):
+    """(internal) Whether every entry of the matrix is an integer or a fraction."""
+    return all(type(v) in (int, Fraction) for row in e.args for v in row)
+
+def _add_terms(terms, start=0):
+    """(internal) Gives `start + terms[0] + terms[1] + ...`, the same as adding
+    the terms one at a time with `+` (down to the order of the terms in the
+    result), but without evaluating a Plus for every term.
+
+    Like terms are collected as they come, as `rule_plus_collect` does.  Each
+    evaluation of the running sum drops the terms that have cancelled, so a
+    term that comes back later goes at the end; adding two numbers is plain
+    Python arithmetic, which keeps even a zero."""
+    if head(start) == "number" and all(head(t) == "number" for t in terms):
+        return norm_num(sum(terms, start))
+    # [coefficient, monomial] pairs of the running sum, with monomial 1 for the number
+    slots = []
+    def collect(pairs):
+        for c, m in pairs:
+            for slot in slots:
+                if slot[1] == m:
+                    slot[0] += c
+                    break
+            else:
+                slots.append([c, m])
+    for i, t in enumerate([start, *terms]):
+        evaluated = i > 0 and (head(t) != "number" or any(m != 1 for c, m in slots))
+        collect(map(split_summand, t.args if head(t) == "Plus" else [t]))
+        while evaluated:
+            # drop cancelled terms, and renormalize the coefficients like the
+            # evaluator does (for instance 1.0 * a is just a)
+            prev = [[1 if m != 1 and c == 1 else norm_num(c), m] for c, m in slots if c != 0]
+            # a sum left with coefficient 1 is flattened into the running sum,
+            # which is then evaluated again
+            evaluated = any(c == 1 and head(m) == "Plus" for c, m in prev)
+            slots = []
+            for c, m in prev:
+                if c == 1 and head(m) == "Plus":
+                    collect(map(split_summand, m.args))
+                else:
+                    collect([[c, m]])
+            if not slots:
+                slots = [[0, 1]]
+    if all(m == 1 for c, m in slots):
+        return norm_num(slots[0][0])
+    vals = [c * m for c, m in slots]
+    return evaluate(expr("Plus", *vals)) if len(vals) > 1 else vals[0]
+
+def _det_bareiss(rows):
+    """(internal) Determinant of a square matrix of integers and fractions
+    using fraction-free (Bareiss) elimination.  Each division is exact, so
+    this is only used for exact entries; floats and symbolic entries use
+    cofactor expansion, since floating-point division rounds differently
+    and quotients of polynomials are not simplified."""
+    M = [list(row) for row in rows]
+    n = len(M)
+    sign = 1
+    prev = 1
+    for k in range(n - 1):
+        if M[k][k] == 0:
+            # swap in a row with a nonzero pivot, if there is one
+            for i in range(k + 1, n):
+                if M[i][k] != 0:
+                    M[k], M[i] = M[i], M[k]
+                    sign = -sign
+                    break
+            else:
+                return 0
+        p = M[k][k]
+        for i in range(k + 1, n):
+            for j in range(k + 1, n):
+                x = p * M[i][j] - M[i][k] * M[k][j]
+                # The division is exact.  Use Python arithmetic rather than `frac`,
+                # which factors its arguments and the intermediate values can be large.
+                M[i][j] = x // prev if type(x) == int and type(prev) == int else x / prev
+        prev = p
+    return norm_num(sign * M[n - 1][n - 1])
+
+def _subdet(rows):
+    """(internal) Returns a function `subdet(row_mask, col_mask)` giving the
+    determinant of the submatrix of `rows` with the rows and columns
+    whose bits are set in the masks (which must have the same number of
+    bits set).  Uses cofactor expansion along the first selected column,
+    memoized so that sub-determinants shared between expansions (and
+    between calls, as in `minors`) are computed only once."""
+    @functools.lru_cache(maxsize=None)
+    def subdet(row_mask, col_mask):
+        j = (col_mask & -col_mask).bit_length() - 1
+        if row_mask & (row_mask - 1) == 0:
+            return rows[row_mask.bit_length() - 1][j]
+        # Expand along the first selected column
+        acc = 0
+        sign = 1
+        for r in range(len(rows)):
+            if row_mask & (1 << r):
+                acc += sign * rows[r][j] * subdet(row_mask & ~(1 << r), col_mask & ~(1 << j))
+                sign = -sign
+        return acc
+    return subdet
+
+def _minor_dets(e):
+    """(internal) Returns a function `minor(i, j)` giving the determinant of the
+    square matrix `e` with row `i` and column `j` deleted (0-indexed)."""
+    rows = e.args
+    n = len(rows)
+    if _is_exact(e):
+        # rows with row i deleted, shared by all the minors for row i
+        row_del = {}
+        def minor(i, j):
+            if i not in row_del:
+                row_del[i] = rows[:i] + rows[i+1:]
+            return _det_bareiss([r[:j] + r[j+1:] for r in row_del[i]])
+    else:
+        subdet = _subdet(rows)
+        full = (1 << n) - 1
+        def minor(i, j):
+            return subdet(full & ~(1 << i), full & ~(1 << j))
+    return minor
 
 @downvalue("det", def_expr=True)
 def det(e):
     """Computes the determinant of the given matrix."""
     if head(e) != "matrix":
         raise Inapplicable
-    def expand(rows):
-        if len(rows) == 1:
-            assert len(rows[0]) == 1
-            return rows[0][0]
-        # Expand along the first column
-        acc = 0
-        for i in range(len(rows)):
-            submatrix = [row[1:] for row in rows[:i] + rows[i+1:]]
-            acc += (-1) ** i * rows[i][0] * expand(submatrix)
-        return acc
-    if nrows(e) != ncols(e):
+    n = nrows(e)
+    if n != ncols(e):
         raise ValueError("det expecting square matrix")
-    r = expand(e.args)
-    return r
+    if _is_exact(e):
+        return _det_bareiss(e.args)
+    full = (1 << n) - 1
+    return _subdet(e.args)(full, full)
 
 @downvalue("tr", def_expr=True)
 def tr(e):
     """Computes the trace of the given matrix."""
     if head(e) != "matrix":
         raise Inapplicable
-    if nrows(e) != ncols(e):
+    n = nrows(e)
+    if n != ncols(e):
         raise ValueError("trace of non-square matrix")
-    return sum(e[i,i] for i in irange(nrows(e)))
+    rows = e.args
+    return sum(rows[i][i] for i in range(n))
 
 def charpoly(A, t=var("t")):
     """Gives `det(A - t * identity_matrix(nrows(A)))`, the characteristic polynomial.
@@ -356,18 +501,14 @@ def minors(e):
     row i and column j."""
     if head(e) != "matrix":
         raise Inapplicable
-    if nrows(e) != ncols(e):
-        raise ValueError("minors expecting square matrix")
     n = nrows(e)
-    rows = []
-    for i in range(n):
-        row = []
-        for j in range(n):
-            submatrix = matrix(*([e.args[i0][j0] for j0 in range(n) if j0 != j]
-                                 for i0 in range(n) if i0 != i))
-            row.append(det(submatrix))
-        rows.append(row)
-    return matrix(*rows)
+    if n != ncols(e):
+        raise ValueError("minors expecting square matrix")
+    if n == 1:
+        # Deleting the only row and column would give a 0x0 matrix, which we don't allow.
+        raise ValueError("We require matrices to have at least one row and column.")
+    minor = _minor_dets(e)
+    return _matrix_unchecked([[minor(i, j) for j in range(n)] for i in range(n)])
 
 @downvalue("Times")
 def rule_scalar_multiplication(*args):
@@ -380,26 +521,46 @@ def rule_scalar_multiplication(*args):
         if head(a) == "matrix":
             # assume all the other terms are scalars
             rest = evaluate(expr("Times", *args[:i], *args[i+1:]))
-            return Expr("matrix", [[rest * x for x in row] for row in a.args])
+            if type(rest) == int and rest == 1:
+                return a
+            # Exact int zeros stay zero (unless a float would turn them into 0.0),
+            # and exact int ones become `rest`.
+            keeps_zero = type(rest) not in (float, complex)
+            def scale(x):
+                if type(x) == int:
+                    if x == 0 and keeps_zero:
+                        return 0
+                    if x == 1:
+                        return rest
+                return rest * x
+            return _matrix_unchecked([[scale(x) for x in row] for row in a.args])
     raise Inapplicable
 
 @downvalue("Plus")
 def rule_matrix_addition(*args):
     """Addition of vectors and matrices of compatible size.  Raises a `ValueError` if incompatible."""
-    for i in range(len(args) - 1):
-        if head(args[i]) != "matrix":
-            continue
-        for j in range(i + 1, len(args)):
-            if head(args[j]) != "matrix":
-                continue
-            if nrows(args[i]) != nrows(args[j]):
-                raise ValueError("The added matrices have different numbers of rows.")
-            if ncols(args[i]) != ncols(args[j]):
-                raise ValueError("The added matrices have different numbers of columns.")
-            a2 = Expr("matrix", [[ci + cj for ci, cj in zip(rowi, rowj)]
-                                 for rowi, rowj in zip(args[i].args, args[j].args)])
-            return expr("Plus", *args[:i], a2, *args[i+1:j], *args[j+1:])
-    raise Inapplicable
+    idxs = [i for i, a in enumerate(args) if head(a) == "matrix"]
+    if len(idxs) <= 1:
+        raise Inapplicable
+    mats = [args[i].args for i in idxs]
+    m, n = len(mats[0]), len(mats[0][0])
+    for a in mats[1:]:
+        if len(a) != m:
+            raise ValueError("The added matrices have different numbers of rows.")
+        if len(a[0]) != n:
+            raise ValueError("The added matrices have different numbers of columns.")
+    # Sum all the matrices in one pass, putting the result where the first matrix was.
+    if len(mats) == 2 or all(_is_numeric(args[i]) for i in idxs):
+        # A single `+` per entry, which is plain arithmetic for numbers.
+        sums = mats[0]
+        for a in mats[1:]:
+            sums = [[x + y for x, y in zip(r1, r2)] for r1, r2 in zip(sums, a)]
+        summed = _matrix_unchecked(sums)
+    else:
+        summed = _matrix_unchecked([[_add_terms(t[1:], t[0]) for t in zip(*rows)]
+                                     for rows in zip(*mats)])
+    rest = [a for a in args if head(a) != "matrix"]
+    return expr("Plus", *rest[:idxs[0]], summed, *rest[idxs[0]:])
 
 # TODO make this an "expansion" that doesn't apply during evaluation?
 @downvalue("MatTimes")
@@ -411,16 +572,16 @@ def reduce_matmul(A, B):
         raise Inapplicable
     if ncols(A) != nrows(B):
         raise ValueError("Number of columns of first argument does not equal number of rows of second argument")
-    C = []
-    for i in irange(nrows(A)):
-        row = []
-        C.append(row)
-        for j in irange(ncols(B)):
-            x = 0
-            for k in irange(ncols(A)):
-                x += A[i,k] * B[k,j]
-            row.append(x)
-    return matrix(*C)
+    Ar = A.args
+    # the columns of B, so the inner loops walk a single sequence
+    Bt = list(zip(*B.args))
+    if _is_numeric(A) and _is_numeric(B):
+        # Plain numbers: do the arithmetic directly rather than through evaluate.
+        return _matrix_unchecked([[norm_num(sum(x * y for x, y in zip(row, col))) for col in Bt]
+                                  for row in Ar])
+    # Sum all the products at once rather than evaluating a Plus per term.
+    return _matrix_unchecked([[_add_terms([x * y for x, y in zip(row, col)]) for col in Bt]
+                              for row in Ar])
 
 @downvalue("MatTimes")
 def reduce_linear_comb(lst, c):
@@ -448,11 +609,17 @@ def adj(e):
     if n == 1:
         # Special case since we don't allow 0x0 matrices, which C(0, 0) would construct.
         return matrix([1])
-    def C(i0, j0):
-        """(i,j) cofactor"""
-        rows2 = [[v for j,v in enumerate(row) if j != j0] for i,row in enumerate(rows) if i != i0]
-        return det(matrix(*rows2))
-    return matrix(*[[(-1)**(i + j) * C(j, i) for j in range(n)] for i in range(n)])
+    minor = _minor_dets(e)
+    cofactors = []
+    for i in range(n):
+        # the sign of the (i,j) cofactor is (-1)**(i + j)
+        sign = 1 if i % 2 == 0 else -1
+        row = []
+        for j in range(n):
+            row.append(sign * minor(j, i))
+            sign = -sign
+        cofactors.append(row)
+    return _matrix_unchecked(cofactors)
 
 @downvalue("Pow")
 def reduce_matrix_inverse(A, n):
@@ -475,7 +642,9 @@ def reduce_matrix_inverse(A, n):
         if i & npos:
             P = P @ B
         i = i << 1
-        B = B @ B
+        if i <= npos:
+            # skip the square that would go unused after the last bit
+            B = B @ B
 
     if n >= 0:
         return P
@@ -484,7 +653,7 @@ def reduce_matrix_inverse(A, n):
         if d == 0:
             raise ValueError("Taking inverse of singular matrix")
         a = adj(P)
-        return matrix(*[[frac(v, d) for v in row] for row in a.args])
+        return _matrix_unchecked([[frac(v, d) for v in row] for row in a.args])
 
 def row_reduce(e, rref=True, steps_out=None, to_col=None):
     """Puts the matrix into row echelon form.
@@ -511,7 +680,6 @@ def row_reduce(e, rref=True, steps_out=None, to_col=None):
     # copy the matrix
     mat = [[v for v in row] for row in e.args]
 
-    rows = len(mat)
     cols = len(mat[0])
 
     if to_col == None:
@@ -522,29 +690,110 @@ def row_reduce(e, rref=True, steps_out=None, to_col=None):
 
     to_col = min(cols, to_col) # make sure it's in range
 
+    _row_reduce(mat, to_col, rref, None if steps_out is None else _record_steps(steps_out))
+    return _matrix_unchecked(mat)
+
+def _leading(row, start=0):
+    """(internal) The index of the first nonzero entry of the row at or after `start`,
+    or `len(row)` if there is none."""
+    for k in range(start, len(row)):
+        if row[k] != 0:
+            return k
+    return len(row)
+
+def _record_steps(steps_out):
+    """(internal) Gives a `log` for `_row_reduce` that appends the TeX for each
+    row operation to the list `steps_out`."""
+    def log(op, i, j, c):
+        if op == "swap":
+            steps_out.append(rf"R_{i+1} \leftrightsquigarrow R_{j+1}")
+            return
+        Ri = var(f"R_{i+1}")
+        if op == "scale":
+            steps_out.append(rf"{Ri} \rightsquigarrow {c * Ri}")
+        else:
+            Rj = var(f"R_{j+1}")
+            steps_out.append(rf"{Ri} \rightsquigarrow {Ri + c * Rj}")
+    return log
+
+def _ignore_step(op, i, j, c):
+    """(internal) The `log` for `_row_reduce` when no steps are recorded."""
+    pass
+
+def _row_reduce(mat, to_col, rref, log=None):
+    """(internal) Row reduces `mat`, a list of rows, in place, for pivots in the
+    columns before `to_col`, putting it into reduced row echelon form if `rref`
+    is true.  See `row_reduce`.
+
+    If `log` is given, it is called as `log(op, i, j, c)` for each row operation,
+    where `op` is one of "swap" (rows i and j), "scale" (row i by c) and "replace"
+    (row i plus c times row j).  Returns the list of pivot positions as (row, column)
+    pairs, 0-indexed."""
+    rows = len(mat)
+    cols = len(mat[0])
+
+    exact = all(type(v) in (int, Fraction) for row in mat for v in row)
+    # For matrices of rationals, eliminate without dividing by the pivot (Bareiss),
+    # and only normalize the rows at the end.  Every row below the pivot row is then
+    # the corresponding row from Lay's algorithm times the most recent pivot.
+    # Not used when recording steps, since the steps should be the ones from Lay.
+    fraction_free = log is None and exact
+    if log is None:
+        log = _ignore_step
+
+    # first_nz[i] is the column of the leading entry of row i (cols for a zero row),
+    # kept up to date by the row operations so that zero tests don't rescan rows.
+    first_nz = [_leading(row) for row in mat]
+    # For exact entries, nz_cols[i] caches the columns where row i is nonzero (None if
+    # not yet computed).  Otherwise adding c * 0 can still change an entry (to a float
+    # zero, say), so replacements update every column.
+    nz_cols = [None] * rows
+
     def swap(i, j):
         # R_i <~~> R_j
         mat[i], mat[j] = mat[j], mat[i]
-        if steps_out != None:
-            steps_out.append(rf"R_{i+1} \leftrightsquigarrow R_{j+1}")
+        first_nz[i], first_nz[j] = first_nz[j], first_nz[i]
+        nz_cols[i], nz_cols[j] = nz_cols[j], nz_cols[i]
+        log("swap", i, j, None)
     def scale(i, c):
         # R_i ~~> c * R_i
+        # (c is nonzero, so first_nz[i] and nz_cols[i] are unchanged)
         for k in range(cols):
             mat[i][k] *= c
-        if steps_out != None:
-            Ri = var(f"R_{i+1}")
-            steps_out.append(rf"{Ri} \rightsquigarrow {c * Ri}")
+        log("scale", i, None, c)
     def replace(i, j, c):
         # R_i ~~> R_i + c * R_j
-        for k in range(cols):
+        if c == 0:
+            return
+        if exact:
+            if nz_cols[j] is None:
+                nz_cols[j] = [k for k in range(first_nz[j], cols) if mat[j][k] != 0]
+            # only the columns where R_j is nonzero change
+            changed = nz_cols[j]
+        else:
+            changed = range(cols)
+        for k in changed:
             mat[i][k] += c * mat[j][k]
-        if steps_out != None:
-            Ri = var(f"R_{i+1}")
-            Rj = var(f"R_{j+1}")
-            steps_out.append(rf"{Ri} \rightsquigarrow {Ri + c * Rj}")
+        nz_cols[i] = None
+        # entries before both leading entries stay zero
+        first_nz[i] = _leading(mat[i], min(first_nz[i], first_nz[j]))
+        log("replace", i, j, c)
+    def eliminate(k, i, j, p, prev):
+        # R_k ~~> (p * R_k - m * R_i) / prev where m = mat[k][j] (fraction-free step).
+        # Rows below the pivot row are zero before column j.  The division is exact.
+        m = mat[k][j]
+        row_k = mat[k]
+        row_i = mat[i]
+        for l in range(j, cols):
+            row_k[l] = norm_num(Fraction(p * row_k[l] - m * row_i[l], prev))
+        nz_cols[k] = None
+        first_nz[k] = _leading(row_k, j)
     def is_zero(i):
         # whether row i is a zero row
-        return all(mat[i][k] == 0 for k in range(cols))
+        return first_nz[i] == cols
+
+    pivs = []
+    prev = 1
 
     i = 0
     j = 0
@@ -559,39 +808,51 @@ def row_reduce(e, rref=True, steps_out=None, to_col=None):
             last_nz -= 1
         if mat[i][j] == 0:
             for k in range(i + 1, last_nz + 1):
-                if mat[k][j] != 0:
+                if first_nz[k] <= j and mat[k][j] != 0:
                     swap(i, k)
                     break
         if mat[i][j] == 0:
             j += 1
             continue
-        if mat[i][j] != 1:
-            scale(i, frac(1, mat[i][j]))
-        for k in range(i + 1, last_nz + 1):
-            if mat[k][j] != 0:
-                replace(k, i, -mat[k][j])
+        if fraction_free:
+            p = mat[i][j]
+            for k in range(i + 1, last_nz + 1):
+                if not is_zero(k) and (p != prev or mat[k][j] != 0):
+                    eliminate(k, i, j, p, prev)
+            prev = p
+        else:
+            if mat[i][j] != 1:
+                scale(i, frac(1, mat[i][j]))
+            for k in range(i + 1, last_nz + 1):
+                if first_nz[k] <= j and mat[k][j] != 0:
+                    replace(k, i, -mat[k][j])
+        pivs.append((i, j))
         i += 1
         j += 1
+    if fraction_free:
+        # make the leading entries 1, and undo the scaling of the remaining rows
+        for r, c in pivs:
+            if mat[r][c] != 1:
+                scale(r, Fraction(1, mat[r][c]))
+        if prev != 1:
+            for r in range(i, last_nz + 1):
+                scale(r, Fraction(1, prev))
     if rref:
-        for i in range(last_nz, -1, -1):
-            for j in range(to_col):
-                if mat[i][j] != 0:
-                    # in fact, the entry is 1
-                    for k in range(i - 1, -1, -1):
-                        if mat[k][j] != 0:
-                            replace(k, i, -mat[k][j])
-                    break
-    return matrix(*mat)
-
+        for i, j in reversed(pivs):
+            # in fact, the entry is 1
+            for k in range(i - 1, -1, -1):
+                if first_nz[k] <= j and mat[k][j] != 0:
+                    replace(k, i, -mat[k][j])
+    return pivs
 
 @downvalue("rank", def_expr=True)
 def rank(e):
     """Gives the rank of the matrix"""
     if head(e) != "matrix":
         raise Inapplicable
-    e = row_reduce(e, rref=False)
-    assert head(e) == "matrix"
-    return sum(1 for row in e.args if not all(v == 0 for v in row))
+    # the number of pivots from the forward pass of row reduction
+    mat = [[v for v in row] for row in e.args]
+    return len(_row_reduce(mat, len(mat[0]), False))
 
 @downvalue("nullity", def_expr=True)
 def nullity(e):
@@ -636,13 +897,14 @@ def null_basis(A):
     pivs = pivots(A)
     pivcols = set(j for i,j in pivs)
     pivmap = {i:j for i,j in pivs} # map row to col
+    m, n = nrows(A), ncols(A)
     basis = []
-    for j in irange(ncols(A)):
+    for j in irange(n):
         if j in pivcols:
             continue
         # it's a non-pivot column
-        vec = coord_vec(ncols(A), j)
-        for i in irange(nrows(A)):
+        vec = coord_vec(n, j)
+        for i in irange(m):
             if i not in pivmap:
                 break
             vec[pivmap[i]] = -Ared[i,j]
@@ -699,11 +961,13 @@ def norm(e):
     if head(e) != "matrix":
         raise Inapplicable
 
-    s = 0
-    for row in e.args:
-        for v in row:
-            s += pow(abs(v), 2)
-    return sqrt(s)
+    return _norm(v for row in e.args for v in row)
+
+def _norm(entries):
+    """(internal) The square root of the sum of the absolute squares of the entries."""
+    # Real numbers are squared directly.
+    return sqrt(_add_terms([v * v if type(v) in (int, Fraction, float) else pow(abs(v), 2)
+                            for v in entries]))
 
 @downvalue("normalize", def_expr=True)
 def normalize(e):
@@ -712,7 +976,10 @@ def normalize(e):
     if head(e) != "matrix":
         raise Inapplicable
 
-    return matrix_with_cols(*(pow(norm(col), -1) * col for col in cols(e)))
+    inv_norms = [pow(_norm(col), -1) for col in _cols_raw(e)]
+    # Like `c * col`, a factor equal to 1 (such as 1.0) leaves the column as it is.
+    return _matrix_unchecked([[v if c == 1 else c * v for c, v in zip(inv_norms, row)]
+                              for row in e.args])
 
 def cross(u, v):
     """Gives the cross product of two 3D vectors.
@@ -771,7 +1038,8 @@ def gram_schmidt(A, normalize=True):
     # orthogonal basis we are constructing. consists of (b, dot(b, b)) pairs.
     basis = []
     # R matrix under construction
-    R = zero_matrix(ncols(A))
+    n = ncols(A)
+    R = zero_matrix(n)
 
     for j, v in enumerate(cols(A)):
         for i, (b, bdotb) in enumerate(basis):
@@ -784,7 +1052,7 @@ def gram_schmidt(A, normalize=True):
     if normalize:
         for i, (b, bdob) in enumerate(basis):
             basis[i] = (pow(bdob, frac(-1, 2)) * b, 1)
-            for j in range(ncols(R)):
+            for j in range(n):
                 R[i+1, j+1] = pow(bdob, frac(1, 2)) * R[i+1, j+1]
 
     return matrix_with_cols(*(b for b, bdob in basis)), R
@@ -0,0 +1,78 @@
+from pyquiz.expr import *
+from pyquiz.rand import *
+from pyquiz import *
+seed(100)
+
+def cofactor_det(A):
+    # expansion along the first row, for comparison with `det`
+    n = nrows(A)
+    if n == 1:
+        return A[1, 1]
+    return sum((-1)**(j + 1) * A[1, j] * cofactor_det(row(col(A, [k for k in irange(n) if k != j]), irange(2, n)))
+               for j in irange(n))
+
+def rand_frac_matrix(n, m, a, b):
+    return matrix(*[[frac(randint(a, b), randint(1, 4)) for j in range(m)] for i in range(n)])
+
+assert det(matrix([2, -1, 0], [-1, 2, -1], [0, -1, 2])) == 4
+# singular
+assert det(matrix([1, 2, 3], [4, 5, 6], [7, 8, 9])) == 0
+# needs row swaps
+assert det(matrix([0, 2, 1], [0, 0, 3], [4, 1, 0])) == 24
+assert det(matrix([frac(1, 2), frac(1, 3)], [frac(1, 4), frac(1, 5)])) == frac(1, 60)
+
+# floating-point determinants are zeros of the same type
+d = det(matrix([0.0, 1.0], [0.0, -2.5]))
+assert d == 0 and type(d) == float
+
+for i in range(100):
+    n = randint(1, 5)
+    A = rand_matrix(n, n, -5, 5) if i % 2 == 0 else rand_frac_matrix(n, n, -5, 5)
+    assert det(A) == cofactor_det(A)
+
+# minors and adjugates
+
+A = matrix([2, -1, 0], [-1, 2, -1], [0, -1, 2])
+assert minors(A) == matrix([3, -2, 1], [-2, 4, -2], [1, -2, 3])
+assert adj(A) == matrix([3, 2, 1], [2, 4, 2], [1, 2, 3])
+
+S = matrix([1, 2, 3], [4, 5, 6], [7, 8, 9])
+assert minors(S) == matrix([-3, -6, -3], [-6, -12, -6], [-3, -6, -3])
+assert adj(S) == matrix([-3, 6, -3], [6, -12, 6], [-3, 6, -3])
+
+P = matrix([0, 2, 1], [0, 0, 3], [4, 1, 0])
+assert minors(P) == matrix([-3, -12, 0], [-1, -4, -8], [6, 0, 0])
+assert adj(P) == matrix([-3, 1, 6], [12, -4, 0], [0, 8, 0])
+
+F = matrix([frac(1, 2), frac(1, 3)], [frac(1, 4), frac(1, 5)])
+assert minors(F) == matrix([frac(1, 5), frac(1, 4)], [frac(1, 3), frac(1, 2)])
+assert adj(F) == matrix([frac(1, 5), frac(-1, 3)], [frac(-1, 4), frac(1, 2)])
+
+G = matrix([frac(1, 2), 1, frac(-3, 2)], [2, frac(2, 3), 0], [frac(1, 3), 0, 1])
+assert det(G) == frac(-4, 3)
+assert minors(G) == matrix([frac(2, 3), 2, frac(-2, 9)], [1, 1, frac(-1, 3)], [1, 3, frac(-5, 3)])
+assert adj(G) == matrix([frac(2, 3), -1, 1], [-2, 1, -3], [frac(-2, 9), frac(1, 3), frac(-5, 3)])
+
+# symbolic entries share the subdeterminants of the cofactor expansion
+a, b = var("a"), var("b")
+T = matrix([a, 1, 0], [1, a, 1], [0, 1, a])
+assert adj(T) == matrix([a**2 - 1, -a, 1], [-a, a**2, -a], [1, -a, a**2 - 1])
+
+M = matrix([a, 1, 2, 0], [b, 0, 1, 1], [1, a, 0, 2], [0, 1, b, 1])
+dM, mM, aM = det(M), minors(M), adj(M)
+for i in range(20):
+    x, y = randint(-5, 5), randint(-5, 5)
+    N = replace(M, (a, x), (b, y))
+    assert replace(dM, (a, x), (b, y)) == det(N)
+    assert replace(mM, (a, x), (b, y)) == minors(N)
+    assert replace(aM, (a, x), (b, y)) == adj(N)
+
+# minors of floating-point matrices are floats, as with cofactor expansion
+assert str(minors(matrix([0.5, 2, 2], [0.0, 1, 1.0], [0.0, 0, 1.0]))) == \
+    r"\begin{bmatrix}1.0&0.0&0.0\\2.0&0.5&0.0\\0.0&0.5&0.5\end{bmatrix}"
+
+for i in range(100):
+    n = randint(2, 5)
+    A = rand_matrix(n, n, -5, 5) if i % 2 == 0 else rand_frac_matrix(n, n, -5, 5)
+    assert A @ adj(A) == det(A) * identity_matrix(n)
+    assert minors(A)[1, 1] == det(row(col(A, irange(2, n)), irange(2, n)))
@@ -0,0 +1,101 @@
+from pyquiz.expr import *
+from pyquiz.rand import *
+from pyquiz import *
+seed(100)
+
+a, b = var("a"), var("b")
+
+def rand_sym_matrix(m, n):
+    return matrix(*[[choice([0, 1, -2, 0.0, 0.5, a, b, a + 1, 2 * a, a * b, -(a + 1)]) for j in range(n)]
+                    for i in range(m)])
+
+def product_by_sums(A, B):
+    # each entry added up one term at a time
+    C = []
+    for i in irange(nrows(A)):
+        row = []
+        for j in irange(ncols(B)):
+            x = 0
+            for k in irange(ncols(A)):
+                x += A[i, k] * B[k, j]
+            row.append(x)
+        C.append(row)
+    return matrix(*C)
+
+# products are the same as adding up the terms one at a time, down to the order of the terms
+assert str(matrix([0.0, 1, a]) @ vector(1, 1, 0)) == r"\begin{bmatrix}1.0\end{bmatrix}"
+assert str(matrix([a + 1, 1]) @ vector(1, 1)) == r"\begin{bmatrix}2 + {a}\end{bmatrix}"
+assert str(matrix([-2, b, 3, a + 1]) @ vector(a + 1, a + 1, a + 1, -1)) == \
+    r"\begin{bmatrix}{a} + 1 + {b}\left({a} + 1\right) - \left({a} + 1\right)\end{bmatrix}"
+for i in range(100):
+    m, n, p = randint(1, 3), randint(1, 4), randint(1, 3)
+    A, B = rand_sym_matrix(m, n), rand_sym_matrix(n, p)
+    assert str(A @ B) == str(product_by_sums(A, B))
+
+def sum_by_pairs(mats):
+    # each entry added up one matrix at a time
+    S = mats[0].args
+    for M in mats[1:]:
+        S = [[x + y for x, y in zip(r1, r2)] for r1, r2 in zip(S, M.args)]
+    return matrix(*S)
+
+# sums of several matrices are the same as adding them up one at a time
+assert repr(matrix([1, 2.0]) + matrix([0.0, 0])) == repr(matrix([1.0, 2.0]))
+assert str(matrix([0]) + matrix([a + 1])) == r"\begin{bmatrix}1 + {a}\end{bmatrix}"
+assert str(evaluate(Expr("Plus", [matrix([a]), matrix([0.0]), matrix([2])]))) == r"\begin{bmatrix}{a} + 2\end{bmatrix}"
+for i in range(100):
+    m, n = randint(1, 3), randint(1, 3)
+    mats = [rand_sym_matrix(m, n) for k in range(randint(2, 4))]
+    assert str(evaluate(Expr("Plus", mats))) == str(sum_by_pairs(mats))
+
+# normalizing
+assert normalize(matrix([3, 0], [4, 2])) == matrix([frac(3, 5), 0], [frac(4, 5), 1])
+# a factor of 1.0 leaves the column as it is, as with scalar multiplication
+assert repr(normalize(vector(0.0, 1))) == repr(vector(0.0, 1))
+assert repr(normalize(matrix([3, 0.0], [4, 2]))) == repr(matrix([frac(3, 5), 0.0], [frac(4, 5), 1.0]))
+
+# powers
+assert matrix([1, 1], [1, 0]) ** 10 == matrix([89, 55], [55, 34])
+assert matrix([2, 1], [1, 1]) ** -3 == matrix([5, -8], [-8, 13])
+for i in range(50):
+    n = randint(1, 3)
+    A = rand_matrix(n, n, -3, 3)
+    # including the powers of 2, where the last square is the result
+    k = choice([0, 1, 2, 3, 4, 5, 7, 8])
+    P = identity_matrix(n)
+    for j in range(k):
+        P = P @ A
+    assert A ** k == P
+
+# scalar multiples
+assert repr(1.0 * matrix([1, 2])) == repr(matrix([1, 2]))
+assert repr(0.5 * matrix([0, 1], [2, a])) == repr(matrix([0.0, 0.5], [1.0, 0.5 * a]))
+assert repr(a * matrix([0, 1], [2, 0.0])) == repr(matrix([0, a], [2 * a, 0]))
+assert repr(2 * matrix([0, 1], [frac(1, 2), 0.0])) == repr(matrix([0, 2], [1, 0.0]))
+
+# selecting no rows or columns would give an empty matrix
+for f in [row, col]:
+    try:
+        f(matrix([1, 2], [3, 4]), [])
+        assert False
+    except ValueError:
+        pass
+
+# norms
+assert norm(vector(3, 4)) == 5
+n = norm(vector(0.0, 1, 1))
+assert n == 2 ** 0.5 and type(n) == float
+n = norm(vector(0.0, 0.0))
+assert n == 0 and type(n) == float
+
+# products of matrices of numbers are done with plain Python arithmetic
+assert repr(matrix([1.5, 2], [3, 4]) @ matrix([1, 0], [2, 1])) == repr(matrix([5.5, 2.0], [11, 4]))
+assert (matrix([0.1, 0.2, 0.3]) @ vector(0.4, 0.5, 0.6))[1] == 0.1 * 0.4 + 0.2 * 0.5 + 0.3 * 0.6
+for i in range(100):
+    m, n, p = randint(1, 4), randint(1, 4), randint(1, 4)
+    if i % 2 == 0:
+        A, B = rand_matrix(m, n, -5, 5), rand_matrix(n, p, -5, 5)
+    else:
+        A = matrix(*[[randint(-20, 20) / 10 for j in range(n)] for k in range(m)])
+        B = matrix(*[[frac(randint(-5, 5), randint(1, 3)) for j in range(p)] for k in range(n)])
+    assert repr(A @ B) == repr(product_by_sums(A, B))
@@ -0,0 +1,67 @@
+from pyquiz.expr import *
+from pyquiz.rand import *
+from pyquiz import *
+seed(100)
+
+R = matrix([1, 2, 0, 3, 1], [2, 4, 1, 7, 0], [-1, -2, 1, -2, 3])
+assert row_reduce(R) == matrix([1, 2, 0, 3, 0], [0, 0, 1, 1, 0], [0, 0, 0, 0, 1])
+assert row_reduce(R, rref=False) == matrix([1, 2, 0, 3, 1], [0, 0, 1, 1, -2], [0, 0, 0, 0, 1])
+
+# zero columns and rows
+Z = matrix([0, 0, 2, 4], [0, 3, 6, 0], [0, 1, 2, 0])
+assert row_reduce(Z) == matrix([0, 1, 0, -4], [0, 0, 1, 2], [0, 0, 0, 0])
+assert row_reduce(Z, rref=False) == matrix([0, 1, 2, 0], [0, 0, 1, 2], [0, 0, 0, 0])
+
+S = matrix([1, 2, 3], [4, 5, 6], [7, 8, 9])
+assert row_reduce(S) == matrix([1, 0, -1], [0, 1, 2], [0, 0, 0])
+assert row_reduce(S, rref=False) == matrix([1, 2, 3], [0, 1, 2], [0, 0, 0])
+
+# floating-point multiples of a row turn its zeros into floats too
+assert str(row_reduce(matrix([2, 1.0], [1, 3]))) == r"\begin{bmatrix}1.0&0.0\\0.0&1.0\end{bmatrix}"
+# and adding a multiple of an exact zero still turns -0.0 into 0.0
+assert str(row_reduce(matrix([0.0, -1, -1], [0, 0.0, -2]))) == r"\begin{bmatrix}0.0&1.0&0\\0&-0.0&1\end{bmatrix}"
+
+H = matrix([frac(1, 2), frac(1, 3), 1], [frac(1, 3), frac(1, 4), frac(1, 2)])
+assert row_reduce(H) == matrix([1, 0, 6], [0, 1, -6])
+assert row_reduce(H, rref=False) == matrix([1, frac(2, 3), 2], [0, 1, -6])
+
+def rand_frac_matrix(n, m, a, b):
+    return matrix(*[[frac(randint(a, b), randint(1, 4)) for j in range(m)] for i in range(n)])
+
+# the fraction-free reduction agrees with the reduction that records its steps
+for i in range(100):
+    m, n = randint(1, 5), randint(1, 5)
+    A = rand_matrix_rank(m, n, randint(0, min(m, n))) if i % 2 == 0 else rand_frac_matrix(m, n, -3, 3)
+    for rref in [True, False]:
+        for to_col in [None, 1, n]:
+            assert row_reduce(A, rref=rref, to_col=to_col) == row_reduce(A, rref=rref, to_col=to_col, steps_out=[])
+
+steps = []
+assert row_reduce(matrix([0, 2, 4], [1, 1, 1], [2, 4, 8]), steps_out=steps) == identity_matrix(3)
+assert steps == [r"R_1 \leftrightsquigarrow R_2",
+                 r"{R_3} \rightsquigarrow {R_3} - 2{R_1}",
+                 r"{R_2} \rightsquigarrow \frac{{R_2}}{2}",
+                 r"{R_3} \rightsquigarrow {R_3} - 2{R_2}",
+                 r"{R_3} \rightsquigarrow \frac{{R_3}}{2}",
+                 r"{R_2} \rightsquigarrow {R_2} - 2{R_3}",
+                 r"{R_1} \rightsquigarrow {R_1} - {R_3}",
+                 r"{R_1} \rightsquigarrow {R_1} - {R_2}"]
+
+# rank
+assert rank(R) == 3
+assert rank(Z) == 2
+assert rank(S) == 2
+assert rank(H) == 2
+assert rank(matrix([1], [var("a") + 1], [var("b")])) == 1
+# rounding leaves tiny nonzero entries below the pivots, which aren't counted as rows
+assert rank(matrix([2.2, 2.8], [2.4, 0.4], [1.3, -1.7], [2.0, 0.4])) == 2
+for i in range(100):
+    m, n = randint(1, 5), randint(1, 5)
+    r = randint(0, min(m, n))
+    assert rank(rand_matrix_rank(m, n, r)) == r
+
+# only the columns before to_col get pivots
+assert row_reduce(R, to_col=2) == matrix([1, 2, 0, 3, 1], [0, 0, 1, 1, -2], [0, 0, 1, 1, 4])
+assert row_reduce(R, to_col=3) == matrix([1, 2, 0, 3, 1], [0, 0, 1, 1, -2], [0, 0, 0, 0, 6])
+assert row_reduce(Z, to_col=2) == matrix([0, 1, 2, 0], [0, 0, 2, 4], [0, 0, 0, 0])
+assert row_reduce(Z, to_col=3) == matrix([0, 1, 0, -4], [0, 0, 1, 2], [0, 0, 0, 0])